@@ -10,6 +10,10 @@ from typing import Optional, List
 import shutil
 import re
 
+import numpy as np
+
+from audio_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_CACHE_BYTES, prepare_audio
+
 # ---- Public return types ----------------------------------------------------
 
 @dataclass(frozen=True)
@@ -45,7 +49,7 @@ class Transcript:
 # ---- Public Function -------------------------------------------------------------
 
 def transcribe_audio(
-    audio: str | Path,
+    audio: str | Path | np.ndarray,     # path, or 16 kHz mono float32 samples
     *,
     language: Optional[str] = None,     # None = auto-detect
     model_size: str = "small",          # "tiny" | "base" | "small" | "medium" | "large-v3"
@@ -53,6 +57,8 @@ def transcribe_audio(
     beam_size: int = 5,
     sentence_timestamps: bool = False,   # if you want per-sentence timing
     word_timestamps: bool = False,      # if you want per-word timing
+    audio_cache_dir: Optional[str | Path] = DEFAULT_CACHE_DIR,  # None = let faster-whisper decode every time
+    audio_cache_max_bytes: int = DEFAULT_MAX_CACHE_BYTES,       # LRU entries are evicted beyond this
     # this stuff might be unnecessary
     emit_srt: bool = False,             # segment-based SRT
     emit_vtt: bool = False,             # segment-based VTT
@@ -71,12 +77,17 @@ def transcribe_audio(
         - srt / vtt: segment-based subtitles if requested
         - srt_sentences / vtt_sentences: sentence-based subtitles if requested
     """
-    audio_path = _resolve_path(audio)
+    if isinstance(audio, np.ndarray):
+        model_input = audio
+    elif audio_cache_dir is not None:
+        model_input = prepare_audio(_resolve_path(audio), audio_cache_dir, audio_cache_max_bytes)
+    else:
+        model_input = str(_resolve_path(audio))
     model = _load_model(model_size)
 
     need_words = word_timestamps or sentence_timestamps
     segments_iter, _info = model.transcribe(
-        str(audio_path),
+        model_input,
         language=language,
         vad_filter=vad_filter,
         beam_size=beam_size,
@@ -3,7 +3,10 @@ import os
 from flask import Flask, request, jsonify, session
 
 from AtoT import transcribe_audio
+from audio_cache import probe_duration
 from prompter import PrompterContext
+from scheduler import AdmissionController, AdmissionRejected
+from store import ResultStore
 
 app = Flask(__name__)
 
@@ -14,11 +17,36 @@ ALLOWED_EXTENSIONS = {"wav", "mp3", "mp4", "webm"}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config["SECRET_KEY"] = "changeme"
 app.config["SESSION_TYPE"] = "filesystem"
+app.config["RESULTS_DB"] = "results.db"
+app.config["MAX_CONCURRENT_ANALYSES"] = 1
+app.config["MAX_AUDIO_SECONDS"] = 3600
+app.config["MAX_QUEUE_DEPTH"] = 32
+app.config["MAX_QUEUED_AUDIO_SECONDS"] = 4 * 3600
+app.config["MAX_QUEUED_PER_CLIENT"] = 4
+app.config["MAX_QUEUE_WAIT_SECONDS"] = 600
+# Only enable behind a proxy that sets X-Client-Id itself; clients could otherwise pick any id
+app.config["TRUST_CLIENT_ID_HEADER"] = False
+
+store = ResultStore(app.config["RESULTS_DB"])
+admission = AdmissionController(
+    max_concurrent=app.config["MAX_CONCURRENT_ANALYSES"],
+    max_job_seconds=app.config["MAX_AUDIO_SECONDS"],
+    max_queue_depth=app.config["MAX_QUEUE_DEPTH"],
+    max_queued_seconds=app.config["MAX_QUEUED_AUDIO_SECONDS"],
+    max_queued_per_client=app.config["MAX_QUEUED_PER_CLIENT"],
+    max_wait_seconds=app.config["MAX_QUEUE_WAIT_SECONDS"],
+)
 
 
 def allowed_file(filename: str):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def client_key() -> str:
+    """Identity used for per-client queue limits and fair scheduling."""
+    if app.config["TRUST_CLIENT_ID_HEADER"] and request.headers.get("X-Client-Id"):
+        return request.headers["X-Client-Id"]
+    return request.remote_addr or "anonymous"
+
 @app.route('/api/audio/analyze', methods=['POST'])
 def analyze_audio():
     if "prompter_ctx" not in session.keys() or not session["prompter_ctx"]:
@@ -42,44 +70,61 @@ def analyze_audio():
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
         file.save(filepath)
 
-        # Transcribe the audio file using your AtoT module
-        tx = transcribe_audio(filepath, sentence_timestamps=True, model_size="small")
-        
-        # Process each sentence and perform inversion testing
-        inversion_results = []
-        for i, s in enumerate(tx.sentences, 1):
-            match, inverted_text, inverted_harm_types, explanation_inverted = prompter_ctx.prompt_with_examples_and_inversion(s.text)
-            inversion_results.append({
-                "match": match,
-                "inverted_text": inverted_text,
-                "inverted_harm_types": inverted_harm_types,
-                "explanation_inverted": explanation_inverted
-            })
-
-        # Prepare the response with full transcript and sentence timings
-        sentences = [
-            {
-                "text": s.text,
-                "start": s.start,
-                "end": s.end,
-                "duration": s.end - s.start,
-                "harm_types": result["harm_types"],
-                "explanation": result["explanation"],
-                "inverted_text": inversion["inverted_text"],
-                "inverted_harm_types": inversion["inverted_harm_types"],
-                "explanation_inverted": inversion["explanation_inverted"],
-                "double_standard_detected": not inversion["match"]
-            }
-            for s, result, inversion in zip(tx.sentences, prompter_ctx.history, inversion_results)
-        ]
+        # Size the job without decoding it and wait for a free slot
+        try:
+            duration = probe_duration(filepath)
+        except Exception:
+            return jsonify({"error": "Could not read audio duration"}), 400
+
+        client_id = client_key()
+        try:
+            with admission.admit(duration, client_id) as ticket:
+                # Transcribe the audio file using your AtoT module
+                tx = transcribe_audio(filepath, sentence_timestamps=True, model_size="small")
+
+                # Process each sentence and perform inversion testing
+                inversion_results = []
+                for i, s in enumerate(tx.sentences, 1):
+                    match, inverted_harm_types, inverted_text, explanation_inverted = prompter_ctx.prompt_with_examples_and_inversion(s.text)
+                    inversion_results.append({
+                        "match": match,
+                        "inverted_text": inverted_text,
+                        "inverted_harm_types": inverted_harm_types,
+                        "explanation_inverted": explanation_inverted
+                    })
+
+                # Prepare the response with full transcript and sentence timings
+                sentences = [
+                    {
+                        "text": s.text,
+                        "start": s.start,
+                        "end": s.end,
+                        "duration": s.end - s.start,
+                        "harm_types": result["harm_types"],
+                        "explanation": result["explanation"],
+                        "inverted_text": inversion["inverted_text"],
+                        "inverted_harm_types": inversion["inverted_harm_types"],
+                        "explanation_inverted": inversion["explanation_inverted"],
+                        "double_standard_detected": not inversion["match"]
+                    }
+                    for s, result, inversion in zip(tx.sentences, prompter_ctx.history, inversion_results)
+                ]
+        except AdmissionRejected as e:
+            headers = {"Retry-After": str(int(e.retry_after))} if e.retry_after else {}
+            return jsonify({"error": str(e)}), e.status, headers
 
         print(sentences[0]["harm_types"])
 
+        analysis_id = store.save_analysis(file.filename, tx.text, sentences)
+
         return jsonify({
             "status": "success",
             "full_transcript": tx.text,
             "sentences": sentences,
             "metadata": {
+                "analysis_id": analysis_id,
+                "audio_duration": duration,
+                "queue_wait_seconds": ticket.wait_seconds,
                 "filename": file.filename,
                 "filepath": filepath,
                 "total_double_standards": sum(1 for sent in sentences if sent["double_standard_detected"])
@@ -89,5 +134,54 @@ def analyze_audio():
     session.clear()
     return jsonify({"error": "File type not allowed"}), 400
 
+@app.route('/api/queue/stats', methods=['GET'])
+def queue_stats():
+    return jsonify(admission.stats())
+
+@app.route('/api/analyses', methods=['GET'])
+def list_analyses():
+    return jsonify(store.list_analyses(
+        offset=request.args.get("offset", 0, type=int),
+        limit=request.args.get("limit", 50, type=int),
+    ))
+
+@app.route('/api/analyses/<int:analysis_id>', methods=['GET'])
+def get_analysis(analysis_id: int):
+    include_transcript = request.args.get("transcript", "false").lower() in ("1", "true", "yes")
+    analysis = store.get_analysis(analysis_id, include_transcript=include_transcript)
+    if analysis is None:
+        return jsonify({"error": "Analysis not found"}), 404
+    return jsonify(analysis)
+
+@app.route('/api/analyses/<int:analysis_id>', methods=['DELETE'])
+def delete_analysis(analysis_id: int):
+    if not store.delete_analysis(analysis_id):
+        return jsonify({"error": "Analysis not found"}), 404
+    return jsonify({"status": "success"})
+
+@app.route('/api/analyses/<int:analysis_id>/sentences', methods=['GET'])
+def query_sentences(analysis_id: int):
+    """
+    Query params: start, end (seconds), harm_types (comma-separated, match any),
+    double_standard_detected (true/false), offset, limit.
+    """
+    if store.get_analysis(analysis_id) is None:
+        return jsonify({"error": "Analysis not found"}), 404
+
+    harm_types = [h.strip() for h in request.args.get("harm_types", "").split(",") if h.strip()]
+    double_standard = request.args.get("double_standard_detected")
+    if double_standard is not None:
+        double_standard = double_standard.lower() in ("1", "true", "yes")
+
+    return jsonify(store.query_sentences(
+        analysis_id,
+        start=request.args.get("start", type=float),
+        end=request.args.get("end", type=float),
+        harm_types=harm_types or None,
+        double_standard_detected=double_standard,
+        offset=request.args.get("offset", 0, type=int),
+        limit=request.args.get("limit", 100, type=int),
+    ))
+
 if __name__ == '__main__':
     app.run(debug=True)
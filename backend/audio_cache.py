@@ -0,0 +1,155 @@
+"""
+Decode audio once to 16 kHz mono float32 and reuse it across pipeline passes.
+
+Decoded samples are stored as .npy files keyed by the SHA-256 of the source
+file's bytes and handed back as read-only memory maps, so re-analysing the same
+upload (or a second pass over it) never goes through ffmpeg again. The cache is
+kept under a byte budget by evicting the least recently used entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16_000  # what faster-whisper expects
+DEFAULT_CACHE_DIR = "audio_cache"
+DEFAULT_MAX_CACHE_BYTES = 2 << 30  # ~9 hours of 16 kHz float32 audio (~230 MB/hour)
+
+_HASH_CHUNK = 1 << 20
+_STALE_TMP_SECONDS = 3600  # temp files older than this were left behind by a crashed write
+
+
+# ---- Public API -------------------------------------------------------------
+
+def content_hash(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def prepare_audio(
+    path: str | Path,
+    cache_dir: str | Path = DEFAULT_CACHE_DIR,
+    max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+) -> np.ndarray:
+    """
+    Return the decoded PCM of `path` as a read-only float32 memmap.
+
+    Decodes (and caches) on the first call for a given file content; later calls
+    for identical content only map the cached file.
+    """
+    cached = _cache_path(cache_dir, content_hash(path))
+    try:
+        os.utime(cached)  # mark as recently used
+        return np.load(cached, mmap_mode="r")
+    except FileNotFoundError:
+        pass  # not cached, or evicted by another caller between touch and load
+
+    samples = _decode(path)
+    _store(cached, samples)
+    evict(cache_dir, max_cache_bytes, keep=cached)
+    try:
+        return np.load(cached, mmap_mode="r")
+    except FileNotFoundError:
+        return samples  # evicted again already; the in-memory copy is just as good
+
+
+def evict(cache_dir: str | Path, max_bytes: int, keep: Optional[Path] = None) -> int:
+    """
+    Delete least recently used entries until the cache fits in `max_bytes`. Returns bytes freed.
+
+    `keep` is never deleted, even if it alone exceeds the budget. Temp files from
+    interrupted writes count against the budget and are removed once stale.
+    """
+    now = time.time()
+    entries = []
+    total = freed = 0
+    for p in Path(cache_dir).glob("*.npy*"):
+        try:
+            st = p.stat()
+        except FileNotFoundError:  # evicted concurrently
+            continue
+        total += st.st_size
+        if not p.name.endswith(".tmp"):
+            entries.append((st.st_mtime, st.st_size, p))
+        elif now - st.st_mtime > _STALE_TMP_SECONDS:
+            try:
+                p.unlink()
+                freed += st.st_size
+            except FileNotFoundError:
+                pass
+
+    for _, size, p in sorted(entries, key=lambda e: e[0]):
+        if total - freed <= max_bytes:
+            break
+        if keep is not None and p == keep:
+            continue
+        try:
+            p.unlink()  # open memmaps stay valid until they are closed
+        except FileNotFoundError:
+            continue
+        freed += size
+    return freed
+
+
+def probe_duration(path: str | Path) -> float:
+    """
+    Audio duration in seconds without decoding or hashing the file.
+
+    Uses the container header when it carries a duration. Browser MediaRecorder
+    WebM files usually don't, so fall back to demuxing packets and taking the
+    end of the last one.
+    """
+    import av
+    with av.open(str(path)) as container:
+        if container.duration is not None:
+            return container.duration / av.time_base
+
+        stream = next(iter(container.streams.audio), None)
+        if stream is None:
+            raise ValueError(f"No audio stream in: {path}")
+        if stream.duration is not None and stream.time_base is not None:
+            return float(stream.duration * stream.time_base)
+
+        start = stream.start_time or 0
+        end = None
+        for packet in container.demux(stream):
+            if packet.pts is None or packet.time_base is None:
+                continue  # flush packet
+            packet_end = packet.pts + (packet.duration or 0)
+            if end is None or packet_end > end:
+                end, time_base = packet_end, packet.time_base
+        if end is not None:
+            return float((end - start) * time_base)
+    raise ValueError(f"Could not determine audio duration: {path}")
+
+
+# ---- Private utilities ------------------------------------------------------
+
+def _cache_path(cache_dir: str | Path, digest: str) -> Path:
+    return Path(cache_dir) / f"{digest}.npy"
+
+def _decode(path: str | Path) -> np.ndarray:
+    from faster_whisper import decode_audio
+    return np.ascontiguousarray(decode_audio(str(path), sampling_rate=SAMPLE_RATE), dtype=np.float32)
+
+def _store(target: Path, samples: np.ndarray) -> None:
+    # Write to a temp file and rename, so concurrent readers never map a partial file
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, samples)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,129 @@
+"""
+Dynamic micro-batching for in-process model inference.
+
+Concurrent callers submit single items; a background worker gathers them and
+runs the batch function once per flush, when either `max_batch_size` items are
+waiting or the oldest one has waited `max_wait_ms`. Each caller gets back only
+its own result.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    `batch_fn` must return one result per input, in order.
+
+    `max_batch_size` and `max_wait_ms` may be changed at runtime; they are read on every flush.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], Sequence[R]],
+        *,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+
+        self._queue: queue.Queue[tuple[T, Future, float]] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._full_flushes = 0
+        self._capacity_total = 0  # sum of max_batch_size at each flush
+        self._size_histogram: dict[int, int] = {}
+        self._queue_wait_total = 0.0
+
+    def submit(self, item: T) -> Future:
+        self._ensure_worker()
+        fut: Future = Future()
+        self._queue.put((item, fut, time.monotonic()))
+        return fut
+
+    def __call__(self, item: T) -> R:
+        """Submit one item and block for its result."""
+        return self.submit(item).result()
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "pending": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "mean_batch_size": self._items / self._batches if self._batches else 0.0,
+                "mean_fill_ratio": self._items / self._capacity_total if self._capacity_total else 0.0,
+                "full_flushes": self._full_flushes,
+                "timeout_flushes": self._batches - self._full_flushes,
+                "mean_queue_wait_ms": 1000 * self._queue_wait_total / self._items if self._items else 0.0,
+                "batch_size_histogram": dict(sorted(self._size_histogram.items())),
+            }
+
+    # ---- Internals ----------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            max_size = max(1, self.max_batch_size)
+            deadline = batch[0][2] + self.max_wait_ms / 1000
+
+            while len(batch) < max_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._flush(batch, max_size)
+
+    def _flush(self, batch: list[tuple[T, Future, float]], max_size: int) -> None:
+        now = time.monotonic()
+        # Drop callers that gave up before we got to them
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            results = self.batch_fn([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(batch)} inputs")
+        except BaseException as e:  # even SystemExit must reach the callers, or they block forever
+            for _, fut, _ in batch:
+                fut.set_exception(e)
+        else:
+            for (_, fut, _), result in zip(batch, results):
+                fut.set_result(result)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._full_flushes += int(len(batch) >= max_size)
+            self._capacity_total += max_size
+            self._size_histogram[len(batch)] = self._size_histogram.get(len(batch), 0) + 1
+            self._queue_wait_total += sum(now - enqueued for _, _, enqueued in batch)
@@ -5,10 +5,12 @@ Hate Speech Detection Pipeline
 - Classifies each sentence using unitary/toxic-bert
 - Outputs timestamped classifications to classified_output.json
 - Provides optional direct text-based hate confidence testing
+- Batches concurrent single-sentence classifications into one model call
 """
 
 # === Imports ===
 from AtoT import transcribe_audio
+from batching import MicroBatcher
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 import json
@@ -22,21 +24,55 @@ model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
 
 HATE_THRESHOLD = 0.5  # adjustable threshold for multi-label detection
 
+MAX_BATCH_SIZE = 16    # sentences per forward pass
+MAX_BATCH_WAIT_MS = 5  # how long the first queued sentence may wait for others
+
 
 # === 2. Core Classification Functions ===
-def classify_text(text: str):
+def classify_batch(texts: list[str]):
     """
-    Run toxic-bert classification on a single sentence.
+    Run toxic-bert classification on several sentences in one padded forward pass.
 
     Returns:
-        dict[label -> probability]
+        list[dict[label -> probability]], one per input
     """
-    inputs = tokenizer(text, truncation=True, padding=True, return_tensors="pt")
+    inputs = tokenizer(texts, truncation=True, padding=True, return_tensors="pt")
     with torch.no_grad():
         logits = model(**inputs).logits
-        probs = torch.nn.functional.softmax(logits, dim=-1).squeeze()
+        probs = torch.nn.functional.softmax(logits, dim=-1)
     labels = model.config.id2label
-    return {labels[i]: float(probs[i]) for i in range(len(labels))}
+    return [{labels[i]: float(row[i]) for i in range(len(labels))} for row in probs.tolist()]
+
+
+def classify_texts(texts: list[str]):
+    """
+    Classify sentences that are all available up front, MAX_BATCH_SIZE per forward pass.
+    """
+    results = []
+    for i in range(0, len(texts), MAX_BATCH_SIZE):
+        results.extend(classify_batch(texts[i:i + MAX_BATCH_SIZE]))
+    return results
+
+
+# Shared across threads: concurrent classify_text calls are flushed together.
+# Only worth it for callers that really run concurrently; loops should use classify_texts.
+# Tune at runtime via batcher.max_batch_size / batcher.max_wait_ms; metrics via batcher.stats().
+batcher = MicroBatcher(
+    classify_batch,
+    max_batch_size=MAX_BATCH_SIZE,
+    max_wait_ms=MAX_BATCH_WAIT_MS,
+    name="toxic-bert-batcher",
+)
+
+
+def classify_text(text: str):
+    """
+    Run toxic-bert classification on a single sentence.
+
+    Returns:
+        dict[label -> probability]
+    """
+    return batcher(text)
 
 
 def get_labels(scores):
@@ -52,9 +88,12 @@ def get_hate_confidence(text: str) -> str:
     Compute an overall 'hate speech confidence' score for the text.
     Uses relevant toxic-bert output categories.
     """
+    return _hate_confidence(classify_text(text))
+
+
+def _hate_confidence(scores) -> str:
     THRESHOLD = 0.7
 
-    scores = classify_text(text)
     hate_labels = ["toxic", "severe_toxic", "threat", "insult", "identity_hate"]
     hate_scores = [scores[lbl] for lbl in hate_labels if lbl in scores]
 
@@ -107,8 +146,8 @@ def classify_audio_file(audio_path: str, output_path: str = "classified_output.j
     tx = transcribe_audio(audio_path, sentence_timestamps=True, vad_filter=False)
 
     results = []
-    for s in tx.sentences:
-        scores = classify_text(s.text)
+    all_scores = classify_texts([s.text for s in tx.sentences])
+    for s, scores in zip(tx.sentences, all_scores):
         labels = get_labels(scores)
         confidence = max(scores[lbl] for lbl in labels if lbl in scores) if labels != ["neutral"] else 0.0
         explanation = explain_classification(s.text, scores)
@@ -136,8 +175,8 @@ def test_sample_texts(sample_texts, output_path: str = "hate_confidence_results.
     Saves output as JSON.
     """
     results = []
-    for text in sample_texts:
-        conf = get_hate_confidence(text)
+    for text, scores in zip(sample_texts, classify_texts(list(sample_texts))):
+        conf = _hate_confidence(scores)
         results.append({
             "text": text,
             "hate_confidence": conf
@@ -0,0 +1,217 @@
+"""
+Duration-aware admission control for analysis requests.
+
+Each request is sized by its audio duration (see audio_cache.probe_duration)
+before it may use transcription/LLM capacity. Requests over the configured
+limits are rejected up front; the rest wait in a queue. The next job comes
+from the client that has recently been served the least audio; within that,
+jobs run shortest-first, with aging so long jobs still make progress under a
+steady stream of short ones.
+"""
+
+from __future__ import annotations
+
+import itertools
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+
+# ---- Public types -----------------------------------------------------------
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted. `status` is the suggested HTTP status."""
+
+    def __init__(self, message: str, status: int = 503, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass
+class Ticket:
+    client_id: str
+    duration: float
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+    @property
+    def wait_seconds(self) -> float:
+        return (self.started_at or time.monotonic()) - self.enqueued_at
+
+
+# ---- Admission controller ---------------------------------------------------
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        max_concurrent: int = 1,             # jobs allowed to run the pipeline at once
+        max_job_seconds: float = 3600.0,     # longest accepted audio
+        max_queue_depth: int = 32,           # waiting jobs before new ones are turned away
+        max_queued_seconds: float = 4 * 3600.0,  # total waiting audio before new ones are turned away
+        max_queued_per_client: int = 4,      # waiting jobs one client may have
+        max_wait_seconds: float = 600.0,     # give up on a queued job after this long
+        aging_factor: float = 1.0,           # seconds of priority gained per second waited
+        service_half_life: float = 600.0,    # how quickly a client's served audio is forgotten
+        stats_window: int = 1000,            # recent jobs kept for wait-time statistics
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_job_seconds = max_job_seconds
+        self.max_queue_depth = max_queue_depth
+        self.max_queued_seconds = max_queued_seconds
+        self.max_queued_per_client = max_queued_per_client
+        self.max_wait_seconds = max_wait_seconds
+        self.aging_factor = aging_factor
+        self.service_half_life = service_half_life
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: list[Ticket] = []
+        self._running: dict[int, Ticket] = {}
+        self._served: dict[str, tuple[float, float]] = {}  # client -> (audio seconds, as of)
+
+        self._waits: deque[float] = deque(maxlen=stats_window)
+        self._admitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._timed_out = 0
+
+    @contextmanager
+    def admit(self, duration: float, client_id: str = "anonymous") -> Iterator[Ticket]:
+        """
+        Block until the job may run, then hold a slot for the duration of the `with` block.
+
+        Raises AdmissionRejected if the job is too long, the queue is full, or it waited too long.
+        """
+        ticket = self._enqueue(duration, client_id)
+        try:
+            self._wait_for_turn(ticket)
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._waits)
+            now = time.monotonic()
+            return {
+                "running": len(self._running),
+                "queue_depth": len(self._waiting),
+                "clients_waiting": len({t.client_id for t in self._waiting}),
+                "queued_audio_seconds": sum(t.duration for t in self._waiting),
+                "running_audio_seconds": sum(t.duration for t in self._running.values()),
+                "oldest_wait_seconds": max((now - t.enqueued_at for t in self._waiting), default=0.0),
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "completed": self._completed,
+                "wait_seconds": {
+                    "count": len(waits),
+                    "mean": statistics.fmean(waits) if waits else 0.0,
+                    "p50": _percentile(waits, 0.50),
+                    "p95": _percentile(waits, 0.95),
+                    "max": waits[-1] if waits else 0.0,
+                },
+                "limits": {
+                    "max_concurrent": self.max_concurrent,
+                    "max_job_seconds": self.max_job_seconds,
+                    "max_queue_depth": self.max_queue_depth,
+                    "max_queued_seconds": self.max_queued_seconds,
+                    "max_queued_per_client": self.max_queued_per_client,
+                    "max_wait_seconds": self.max_wait_seconds,
+                },
+            }
+
+    # ---- Internals ----------------------------------------------------------
+
+    def _enqueue(self, duration: float, client_id: str) -> Ticket:
+        with self._cond:
+            if duration > self.max_job_seconds:
+                self._rejected += 1
+                raise AdmissionRejected(
+                    f"Audio is {duration:.0f}s long; the limit is {self.max_job_seconds:.0f}s", status=413
+                )
+
+            queued_seconds = sum(t.duration for t in self._waiting)
+            if len(self._waiting) >= self.max_queue_depth or queued_seconds + duration > self.max_queued_seconds:
+                self._rejected += 1
+                raise AdmissionRejected("Server is at capacity, try again later", retry_after=self._retry_hint())
+
+            if sum(1 for t in self._waiting if t.client_id == client_id) >= self.max_queued_per_client:
+                self._rejected += 1
+                raise AdmissionRejected(
+                    "Too many queued analyses for this client", status=429, retry_after=self._retry_hint()
+                )
+
+            ticket = Ticket(client_id=client_id, duration=duration, seq=next(self._seq))
+            self._waiting.append(ticket)
+            self._cond.notify_all()
+            return ticket
+
+    def _wait_for_turn(self, ticket: Ticket) -> None:
+        deadline = ticket.enqueued_at + self.max_wait_seconds
+        with self._cond:
+            while not (len(self._running) < self.max_concurrent and self._next_ticket() is ticket):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timed_out += 1
+                    raise AdmissionRejected("Timed out waiting in queue", retry_after=self._retry_hint())
+                self._cond.wait(remaining)
+
+            self._waiting.remove(ticket)
+            ticket.started_at = time.monotonic()
+            self._running[ticket.seq] = ticket
+            self._served[ticket.client_id] = (self._recent_service(ticket.client_id) + ticket.duration, ticket.started_at)
+            self._waits.append(ticket.wait_seconds)
+            self._admitted += 1
+
+    def _release(self, ticket: Ticket) -> None:
+        with self._cond:
+            if ticket.seq in self._running:
+                del self._running[ticket.seq]
+                self._completed += 1
+                # Forget clients whose service has decayed away, so the table stays small
+                now = time.monotonic()
+                for client_id in [c for c in self._served if self._recent_service(c, now) < 1.0]:
+                    del self._served[client_id]
+            elif ticket in self._waiting:
+                self._waiting.remove(ticket)
+            self._cond.notify_all()
+
+    def _next_ticket(self) -> Optional[Ticket]:
+        # Least recently served client first, then shortest (aged) job, then arrival order
+        now = time.monotonic()
+        return min(
+            self._waiting,
+            key=lambda t: (
+                self._recent_service(t.client_id, now),
+                t.duration - self.aging_factor * (now - t.enqueued_at),
+                t.seq,
+            ),
+            default=None,
+        )
+
+    def _recent_service(self, client_id: str, now: Optional[float] = None) -> float:
+        # Audio seconds admitted for this client, halved every `service_half_life` seconds
+        if client_id not in self._served:
+            return 0.0
+        seconds, as_of = self._served[client_id]
+        elapsed = (now if now is not None else time.monotonic()) - as_of
+        return seconds * 0.5 ** (elapsed / self.service_half_life)
+
+    def _retry_hint(self) -> float:
+        # Rough estimate: queued + running audio spread over the available slots
+        backlog = sum(t.duration for t in self._waiting) + sum(t.duration for t in self._running.values())
+        return max(1.0, backlog / max(1, self.max_concurrent))
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
@@ -0,0 +1,230 @@
+"""
+Persist analysis results in SQLite so they can be queried without re-running the pipeline.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+# ---- Schema -----------------------------------------------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename TEXT NOT NULL,
+    full_transcript TEXT NOT NULL,
+    sentence_count INTEGER NOT NULL,
+    total_double_standards INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sentences (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    start REAL NOT NULL,
+    "end" REAL NOT NULL,
+    text TEXT NOT NULL,
+    harm_types TEXT NOT NULL,
+    explanation TEXT,
+    inverted_text TEXT,
+    inverted_harm_types TEXT,
+    explanation_inverted TEXT,
+    double_standard_detected INTEGER NOT NULL
+);
+
+-- Interval lookups: sentences overlapping [start, end) of one analysis
+CREATE INDEX IF NOT EXISTS idx_sentences_start ON sentences(analysis_id, start);
+CREATE INDEX IF NOT EXISTS idx_sentences_end ON sentences(analysis_id, "end");
+CREATE INDEX IF NOT EXISTS idx_sentences_position ON sentences(analysis_id, position);
+CREATE INDEX IF NOT EXISTS idx_sentences_double_standard
+    ON sentences(analysis_id, double_standard_detected, position);
+
+CREATE TABLE IF NOT EXISTS sentence_harm_types (
+    sentence_id INTEGER NOT NULL REFERENCES sentences(id) ON DELETE CASCADE,
+    analysis_id INTEGER NOT NULL,
+    harm_type TEXT NOT NULL,
+    PRIMARY KEY (sentence_id, harm_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_harm_types_lookup
+    ON sentence_harm_types(analysis_id, harm_type, sentence_id);
+"""
+
+_SENTENCE_COLUMNS = (
+    'position, start, "end", text, harm_types, explanation, inverted_text, '
+    "inverted_harm_types, explanation_inverted, double_standard_detected"
+)
+
+MAX_PAGE_SIZE = 500
+
+
+# ---- Public API -------------------------------------------------------------
+
+class ResultStore:
+    """
+    SQLite-backed store of analyses and their per-sentence results.
+
+    A fresh connection is opened per operation, so one instance can be shared
+    between request threads.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def save_analysis(self, filename: str, full_transcript: str, sentences: list[dict[str, Any]]) -> int:
+        """
+        Store one analysis and its sentences. Returns the new analysis id.
+        """
+        total_double_standards = sum(1 for s in sentences if s.get("double_standard_detected"))
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO analyses (filename, full_transcript, sentence_count, total_double_standards, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (filename, full_transcript, len(sentences), total_double_standards, time.time()),
+            )
+            analysis_id = cur.lastrowid
+
+            for position, s in enumerate(sentences):
+                harm_types = list(s.get("harm_types") or [])
+                cur = conn.execute(
+                    f"INSERT INTO sentences (analysis_id, {_SENTENCE_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        analysis_id,
+                        position,
+                        float(s["start"]),
+                        float(s["end"]),
+                        s["text"],
+                        json.dumps(harm_types),
+                        s.get("explanation"),
+                        s.get("inverted_text"),
+                        json.dumps(s.get("inverted_harm_types") or []),
+                        s.get("explanation_inverted"),
+                        int(bool(s.get("double_standard_detected"))),
+                    ),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO sentence_harm_types (sentence_id, analysis_id, harm_type) VALUES (?, ?, ?)",
+                    [(cur.lastrowid, analysis_id, h) for h in harm_types],
+                )
+
+        return analysis_id
+
+    def get_analysis(self, analysis_id: int, *, include_transcript: bool = False) -> Optional[dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+        if row is None:
+            return None
+        analysis = dict(row)
+        if not include_transcript:
+            analysis.pop("full_transcript")
+        return analysis
+
+    def list_analyses(self, *, offset: int = 0, limit: int = 50) -> dict[str, Any]:
+        offset, limit = _clamp_page(offset, limit)
+        with self._connect() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+            rows = conn.execute(
+                "SELECT id, filename, sentence_count, total_double_standards, created_at "
+                "FROM analyses ORDER BY id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return {"total": total, "offset": offset, "limit": limit, "items": [dict(r) for r in rows]}
+
+    def query_sentences(
+        self,
+        analysis_id: int,
+        *,
+        start: Optional[float] = None,       # keep sentences ending after this time
+        end: Optional[float] = None,         # keep sentences starting before this time
+        harm_types: Optional[list[str]] = None,  # match any of these
+        double_standard_detected: Optional[bool] = None,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> dict[str, Any]:
+        """
+        Page through the sentences of one analysis, in transcript order.
+
+        Returns a dict with the total number of matches and the requested page.
+        """
+        offset, limit = _clamp_page(offset, limit)
+
+        clauses = ["s.analysis_id = ?"]
+        params: list[Any] = [analysis_id]
+        if start is not None:
+            clauses.append('s."end" > ?')
+            params.append(float(start))
+        if end is not None:
+            clauses.append("s.start < ?")
+            params.append(float(end))
+        if double_standard_detected is not None:
+            clauses.append("s.double_standard_detected = ?")
+            params.append(int(double_standard_detected))
+        if harm_types:
+            placeholders = ", ".join("?" for _ in harm_types)
+            clauses.append(
+                "EXISTS (SELECT 1 FROM sentence_harm_types h "
+                f"WHERE h.sentence_id = s.id AND h.analysis_id = s.analysis_id AND h.harm_type IN ({placeholders}))"
+            )
+            params.extend(harm_types)
+        where = " AND ".join(clauses)
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM sentences s WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {_SENTENCE_COLUMNS} FROM sentences s WHERE {where} "
+                "ORDER BY s.position LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "sentences": [_row_to_sentence(r) for r in rows],
+        }
+
+    def delete_analysis(self, analysis_id: int) -> bool:
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM analyses WHERE id = ?", (analysis_id,))
+        return cur.rowcount > 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        try:
+            with conn:  # commit on success, rollback on error
+                yield conn
+        finally:
+            conn.close()
+
+
+# ---- Private utilities ------------------------------------------------------
+
+def _clamp_page(offset: int, limit: int) -> tuple[int, int]:
+    return max(0, int(offset)), max(1, min(int(limit), MAX_PAGE_SIZE))
+
+def _row_to_sentence(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "position": row["position"],
+        "text": row["text"],
+        "start": row["start"],
+        "end": row["end"],
+        "duration": row["end"] - row["start"],
+        "harm_types": json.loads(row["harm_types"]),
+        "explanation": row["explanation"],
+        "inverted_text": row["inverted_text"],
+        "inverted_harm_types": json.loads(row["inverted_harm_types"]),
+        "explanation_inverted": row["explanation_inverted"],
+        "double_standard_detected": bool(row["double_standard_detected"]),
+    }
@@ -0,0 +1,123 @@
+import os
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import audio_cache
+from audio_cache import evict, prepare_audio
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Record decode calls; each file decodes to `size` samples of its first byte."""
+    calls = []
+
+    def fake_decode(path):
+        calls.append(str(path))
+        data = open(path, "rb").read()
+        return np.full(len(data), data[0], dtype=np.float32)
+
+    monkeypatch.setattr(audio_cache, "_decode", fake_decode)
+    return calls
+
+
+def _upload(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def _entry(cache_dir, name, size, age):
+    path = cache_dir / name
+    path.write_bytes(b"\0" * size)
+    t = time.time() - age
+    os.utime(path, (t, t))
+    return path
+
+
+def test_cache_hit_skips_decode(tmp_path, decodes):
+    cache_dir = tmp_path / "cache"
+    first = prepare_audio(_upload(tmp_path, "a.wav", b"\x01" * 10), cache_dir)
+    # Same content under another name is the same entry
+    second = prepare_audio(_upload(tmp_path, "b.wav", b"\x01" * 10), cache_dir)
+
+    assert len(decodes) == 1
+    assert isinstance(second, np.memmap)
+    assert not second.flags.writeable
+    assert np.array_equal(first, second)
+    assert second.dtype == np.float32 and len(second) == 10
+
+
+def test_hit_refreshes_lru_position(tmp_path, decodes):
+    cache_dir = tmp_path / "cache"
+    upload = _upload(tmp_path, "a.wav", b"\x01" * 10)
+    prepare_audio(upload, cache_dir)
+    (entry,) = cache_dir.glob("*.npy")
+    old = time.time() - 1000
+    os.utime(entry, (old, old))
+
+    prepare_audio(upload, cache_dir)
+    assert entry.stat().st_mtime > old + 900
+
+
+def test_evict_removes_oldest_until_under_budget(tmp_path):
+    oldest = _entry(tmp_path, "oldest.npy", 100, age=300)
+    middle = _entry(tmp_path, "middle.npy", 100, age=200)
+    newest = _entry(tmp_path, "newest.npy", 100, age=100)
+
+    assert evict(tmp_path, max_bytes=150) == 200
+    assert not oldest.exists() and not middle.exists()
+    assert newest.exists()
+
+    assert evict(tmp_path, max_bytes=150) == 0
+
+
+def test_evict_never_removes_keep(tmp_path):
+    keep = _entry(tmp_path, "keep.npy", 100, age=300)
+    other = _entry(tmp_path, "other.npy", 100, age=100)
+
+    evict(tmp_path, max_bytes=0, keep=keep)
+    assert keep.exists()
+    assert not other.exists()
+
+
+def test_evict_counts_and_reaps_temp_files(tmp_path):
+    stale = _entry(tmp_path, "x.npy.tmp", 100, age=2 * 3600)
+    fresh = _entry(tmp_path, "y.npy.tmp", 100, age=1)
+    entry = _entry(tmp_path, "entry.npy", 100, age=10)
+
+    # Stale temp file goes regardless; the in-progress one still counts against the budget
+    evict(tmp_path, max_bytes=150)
+    assert not stale.exists()
+    assert fresh.exists()
+    assert not entry.exists()
+
+
+def test_new_entries_trigger_eviction(tmp_path, decodes):
+    cache_dir = tmp_path / "cache"
+    entry_bytes = 128 + 10 * 4  # .npy header + 10 float32 samples
+    prepare_audio(_upload(tmp_path, "a.wav", b"\x01" * 10), cache_dir, max_cache_bytes=entry_bytes)
+    prepare_audio(_upload(tmp_path, "b.wav", b"\x02" * 10), cache_dir, max_cache_bytes=entry_bytes)
+
+    (remaining,) = cache_dir.glob("*.npy")
+    assert np.load(remaining)[0] == 2
+
+
+def test_entry_evicted_before_load_is_decoded_again(tmp_path, decodes, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    upload = _upload(tmp_path, "a.wav", b"\x01" * 10)
+    prepare_audio(upload, cache_dir)
+
+    real_utime = os.utime
+
+    def utime_then_evicted(path, *args, **kwargs):
+        real_utime(path, *args, **kwargs)
+        os.unlink(path)
+
+    monkeypatch.setattr(audio_cache.os, "utime", utime_then_evicted)
+    samples = prepare_audio(upload, cache_dir)
+
+    assert len(decodes) == 2
+    assert len(samples) == 10
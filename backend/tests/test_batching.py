@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+from batching import MicroBatcher
+
+
+class Recorder:
+    """batch_fn that records batch sizes and doubles each item."""
+
+    def __init__(self, hold: threading.Event | None = None):
+        self.batches = []
+        self.hold = hold
+
+    def __call__(self, items):
+        if self.hold is not None:
+            self.hold.wait(1)
+        self.batches.append(list(items))
+        return [x * 2 for x in items]
+
+
+def _call_concurrently(batcher, items):
+    results = {}
+
+    def run(i):
+        results[i] = batcher(i)
+
+    threads = [threading.Thread(target=run, args=(i,), daemon=True) for i in items]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+def test_flushes_when_batch_is_full():
+    fn = Recorder()
+    batcher = MicroBatcher(fn, max_batch_size=4, max_wait_ms=10_000)
+
+    results = _call_concurrently(batcher, range(8))
+
+    assert results == {i: 2 * i for i in range(8)}
+    assert sorted(len(b) for b in fn.batches) == [4, 4]
+    stats = batcher.stats()
+    assert (stats["full_flushes"], stats["timeout_flushes"]) == (2, 0)
+
+
+def test_flushes_partial_batch_after_max_wait():
+    fn = Recorder()
+    batcher = MicroBatcher(fn, max_batch_size=16, max_wait_ms=20)
+
+    start = time.monotonic()
+    assert batcher(3) == 6
+    elapsed = time.monotonic() - start
+
+    assert 0.015 <= elapsed < 1
+    assert fn.batches == [[3]]
+    assert batcher.stats()["timeout_flushes"] == 1
+
+
+def test_each_caller_gets_its_own_result():
+    batcher = MicroBatcher(Recorder(), max_batch_size=8, max_wait_ms=20)
+    results = _call_concurrently(batcher, range(30))
+    assert results == {i: 2 * i for i in range(30)}
+
+
+def test_error_reaches_every_caller_in_the_batch():
+    def fail(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(fail, max_batch_size=3, max_wait_ms=10_000)
+    futures = [batcher.submit(i) for i in range(3)]
+    for fut in futures:
+        with pytest.raises(ValueError, match="model exploded"):
+            fut.result(5)
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=2, max_wait_ms=10_000)
+    futures = [batcher.submit(i) for i in range(2)]
+    for fut in futures:
+        with pytest.raises(RuntimeError, match="returned 1 results for 2 inputs"):
+            fut.result(5)
+
+
+def test_base_exception_does_not_kill_the_worker():
+    calls = []
+
+    def fn(items):
+        calls.append(items)
+        if len(calls) == 1:
+            raise SystemExit
+        return items
+
+    batcher = MicroBatcher(fn, max_batch_size=1, max_wait_ms=0)
+    with pytest.raises(SystemExit):
+        batcher.submit(1).result(5)
+    assert batcher.submit(2).result(5) == 2
+
+
+def test_stats_counters():
+    hold = threading.Event()
+    fn = Recorder(hold)
+    batcher = MicroBatcher(fn, max_batch_size=4, max_wait_ms=10_000)
+
+    # First batch is full; change the limit while it is still running
+    futures = [batcher.submit(i) for i in range(4)]
+    time.sleep(0.05)
+    batcher.max_batch_size = 2
+    hold.set()
+    futures += [batcher.submit(i) for i in range(2)]
+    for fut in futures:
+        fut.result(5)
+
+    stats = batcher.stats()
+    assert stats["batches"] == 2
+    assert stats["items"] == 6
+    assert stats["full_flushes"] == 2
+    assert stats["batch_size_histogram"] == {2: 1, 4: 1}
+    assert stats["mean_batch_size"] == 3
+    assert stats["mean_fill_ratio"] == 1.0  # 6 items over 4 + 2 capacity
+    assert stats["pending"] == 0
+    assert stats["mean_queue_wait_ms"] >= 0
+
+
+def test_cancelled_callers_are_skipped():
+    hold = threading.Event()
+    fn = Recorder(hold)
+    batcher = MicroBatcher(fn, max_batch_size=1, max_wait_ms=0)
+
+    blocker = batcher.submit(0)  # occupies the worker until `hold` is set
+    time.sleep(0.05)
+    cancelled = batcher.submit(1)
+    assert cancelled.cancel()
+    hold.set()
+
+    assert blocker.result(5) == 0
+    assert batcher.submit(2).result(5) == 4
+    assert [1] not in fn.batches
@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import AdmissionController, AdmissionRejected
+
+
+def _hold_slot(ac, client_id="holder"):
+    """Occupy the only slot until the returned event is set."""
+    admitted, release = threading.Event(), threading.Event()
+
+    def run():
+        with ac.admit(1, client_id):
+            admitted.set()
+            release.wait()
+
+    t = threading.Thread(target=run, daemon=True)  # a failing test must not hang the run
+    t.start()
+    assert admitted.wait(1)
+    return release, t
+
+
+def _queue_jobs(ac, jobs, order):
+    def run(client_id, duration):
+        with ac.admit(duration, client_id):
+            order.append((client_id, duration))
+
+    start_depth = ac.stats()["queue_depth"]
+    threads = []
+    for client_id, duration in jobs:
+        t = threading.Thread(target=run, args=(client_id, duration), daemon=True)
+        t.start()
+        threads.append(t)
+        _wait_until(lambda: ac.stats()["queue_depth"] == start_depth + len(threads))
+    return threads
+
+
+def _wait_until(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_rejects_jobs_over_the_length_limit_with_413():
+    ac = AdmissionController(max_job_seconds=60)
+    with pytest.raises(AdmissionRejected) as exc:
+        with ac.admit(61):
+            pass
+    assert exc.value.status == 413
+    assert ac.stats()["rejected"] == 1
+
+
+def test_rejects_with_503_when_queue_is_full():
+    ac = AdmissionController(max_queue_depth=1, max_queued_per_client=10)
+    release, holder = _hold_slot(ac)
+    waiter = _queue_jobs(ac, [("a", 10)], [])
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with ac.admit(10, "b"):
+            pass
+    assert exc.value.status == 503
+    assert exc.value.retry_after >= 1
+
+    release.set()
+    for t in [holder, *waiter]:
+        t.join()
+
+
+def test_rejects_with_503_when_queued_audio_is_full():
+    ac = AdmissionController(max_queued_seconds=100)
+    release, holder = _hold_slot(ac)
+    waiter = _queue_jobs(ac, [("a", 80)], [])
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with ac.admit(30, "b"):
+            pass
+    assert exc.value.status == 503
+
+    release.set()
+    for t in [holder, *waiter]:
+        t.join()
+
+
+def test_caps_queued_jobs_per_client_with_429():
+    ac = AdmissionController(max_queued_per_client=2)
+    release, holder = _hold_slot(ac)
+    waiters = _queue_jobs(ac, [("a", 10), ("a", 10)], [])
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with ac.admit(10, "a"):
+            pass
+    assert exc.value.status == 429
+
+    # Other clients are unaffected
+    waiters += _queue_jobs(ac, [("b", 10)], [])
+
+    release.set()
+    for t in [holder, *waiters]:
+        t.join()
+
+
+def test_shortest_job_first_for_one_client():
+    ac = AdmissionController(aging_factor=0)
+    release, holder = _hold_slot(ac)
+    order = []
+    waiters = _queue_jobs(ac, [("a", 30), ("a", 10), ("a", 20)], order)
+
+    release.set()
+    for t in [holder, *waiters]:
+        t.join()
+    assert order == [("a", 10), ("a", 20), ("a", 30)]
+
+
+def test_alternates_between_clients_by_recent_service():
+    ac = AdmissionController(aging_factor=0)
+    release, holder = _hold_slot(ac)
+    order = []
+    waiters = _queue_jobs(ac, [("a", 500), ("a", 50), ("b", 10), ("b", 200)], order)
+
+    release.set()
+    for t in [holder, *waiters]:
+        t.join()
+    # b10 (b=10) -> a50 (a=50) -> b200 (b=210) -> a500
+    assert order == [("b", 10), ("a", 50), ("b", 200), ("a", 500)]
+
+
+def test_timed_out_ticket_leaves_the_queue():
+    ac = AdmissionController(max_wait_seconds=0.05)
+    release, holder = _hold_slot(ac)
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with ac.admit(10, "a"):
+            pass
+    assert exc.value.status == 503
+
+    stats = ac.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["timed_out"] == 1
+
+    release.set()
+    holder.join()
+    with ac.admit(10, "a"):
+        pass
+    assert ac.stats()["completed"] == 2
+
+
+def test_stats_track_running_and_waits():
+    ac = AdmissionController()
+    with ac.admit(42, "a") as ticket:
+        stats = ac.stats()
+        assert stats["running"] == 1
+        assert stats["running_audio_seconds"] == 42
+    assert ticket.started_at is not None
+
+    stats = ac.stats()
+    assert (stats["running"], stats["admitted"], stats["completed"]) == (0, 1, 1)
+    assert stats["wait_seconds"]["count"] == 1
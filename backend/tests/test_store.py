@@ -0,0 +1,108 @@
+import pytest
+
+from store import ResultStore
+
+
+def _sentence(i, *, harm_types=("none",), double_standard=False):
+    return {
+        "text": f"sentence {i}",
+        "start": i * 2.0,
+        "end": i * 2.0 + 1.5,
+        "harm_types": list(harm_types),
+        "explanation": f"explanation {i}",
+        "inverted_text": f"inverted {i}",
+        "inverted_harm_types": ["none"],
+        "explanation_inverted": f"explanation inverted {i}",
+        "double_standard_detected": double_standard,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(tmp_path / "results.db")
+
+
+@pytest.fixture
+def analysis_id(store):
+    # sentence i spans [2i, 2i + 1.5)
+    sentences = [
+        _sentence(0, harm_types=["slur"], double_standard=True),
+        _sentence(1),
+        _sentence(2, harm_types=["incitement", "stereotype"]),
+        _sentence(3, double_standard=True),
+        _sentence(4, harm_types=["stereotype"]),
+    ]
+    return store.save_analysis("clip.wav", "full transcript", sentences)
+
+
+def _positions(result):
+    return [s["position"] for s in result["sentences"]]
+
+
+def test_round_trip_matches_live_response_shape(store, analysis_id):
+    s = store.query_sentences(analysis_id)["sentences"][2]
+    assert s == {
+        "position": 2,
+        "text": "sentence 2",
+        "start": 4.0,
+        "end": 5.5,
+        "duration": 1.5,
+        "harm_types": ["incitement", "stereotype"],
+        "explanation": "explanation 2",
+        "inverted_text": "inverted 2",
+        "inverted_harm_types": ["none"],
+        "explanation_inverted": "explanation inverted 2",
+        "double_standard_detected": False,
+    }
+
+
+def test_get_analysis_summary(store, analysis_id):
+    analysis = store.get_analysis(analysis_id)
+    assert analysis["filename"] == "clip.wav"
+    assert analysis["sentence_count"] == 5
+    assert analysis["total_double_standards"] == 2
+    assert "full_transcript" not in analysis
+    assert store.get_analysis(analysis_id, include_transcript=True)["full_transcript"] == "full transcript"
+    assert store.get_analysis(analysis_id + 1) is None
+
+
+def test_time_range_uses_overlap_with_open_boundaries(store, analysis_id):
+    # Sentence 1 is [2, 3.5): touching at 3.5 or at 2 does not count as overlap
+    assert _positions(store.query_sentences(analysis_id, start=3.5, end=4.0)) == []
+    assert _positions(store.query_sentences(analysis_id, start=3.4, end=4.1)) == [1, 2]
+    assert _positions(store.query_sentences(analysis_id, end=2.0)) == [0]
+    assert _positions(store.query_sentences(analysis_id, start=7.4)) == [3, 4]
+
+
+def test_harm_types_match_any(store, analysis_id):
+    assert _positions(store.query_sentences(analysis_id, harm_types=["stereotype"])) == [2, 4]
+    assert _positions(store.query_sentences(analysis_id, harm_types=["slur", "incitement"])) == [0, 2]
+    assert _positions(store.query_sentences(analysis_id, harm_types=["dehumanization"])) == []
+
+
+def test_filters_combine(store, analysis_id):
+    assert _positions(store.query_sentences(analysis_id, double_standard_detected=True)) == [0, 3]
+    assert _positions(store.query_sentences(analysis_id, double_standard_detected=False, start=3.0)) == [1, 2, 4]
+
+
+def test_paging_reports_total_and_clamps(store, analysis_id):
+    page = store.query_sentences(analysis_id, offset=1, limit=2)
+    assert page["total"] == 5
+    assert _positions(page) == [1, 2]
+
+    page = store.query_sentences(analysis_id, offset=-3, limit=0)
+    assert (page["offset"], page["limit"]) == (0, 1)
+
+
+def test_analyses_are_isolated_and_listed_newest_first(store, analysis_id):
+    other = store.save_analysis("other.wav", "other", [_sentence(0, harm_types=["stereotype"])])
+    assert _positions(store.query_sentences(analysis_id, harm_types=["stereotype"])) == [2, 4]
+    assert [a["id"] for a in store.list_analyses()["items"]] == [other, analysis_id]
+
+
+def test_delete_cascades_to_sentences_and_harm_types(store, analysis_id):
+    assert store.delete_analysis(analysis_id)
+    assert not store.delete_analysis(analysis_id)
+    with store._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sentences").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM sentence_harm_types").fetchone()[0] == 0